@@ -0,0 +1,239 @@
+"""Guard against accidental changes to exported STL models.
+
+Rebuilds the STL exports via ``scripts/build_stl.sh`` and compares the
+SHA-256 digest of every file under ``hardware/stl`` against the committed
+manifest (``checksums.sha256``).  CI fails when the two drift apart so
+that geometry changes always land together with refreshed checksums.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+STL_DIR = REPO_ROOT / "hardware" / "stl"
+MANIFEST = Path(__file__).resolve().with_name("checksums.sha256")
+HASH_CACHE = STL_DIR / ".stl_hash_cache.json"
+BUILD_STAMP = STL_DIR / ".build_inputs.sha256"
+
+
+def _build_inputs_digest() -> str:
+    """Fingerprint everything that feeds ``scripts/build_stl.sh``.
+
+    Covers every OpenSCAD source under ``hardware/`` plus the build
+    script itself, using ``(relpath, mtime_ns, size)`` so the digest is
+    cheap to compute and changes whenever any input does.
+    """
+    inputs = sorted((REPO_ROOT / "hardware").rglob("*.scad"))
+    inputs.append(REPO_ROOT / "scripts" / "build_stl.sh")
+    digest = hashlib.sha256()
+    for source in inputs:
+        try:
+            stat = source.stat()
+        except OSError:
+            continue
+        rel = source.relative_to(REPO_ROOT).as_posix()
+        digest.update(f"{rel}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+def _load_hash_cache() -> dict[str, list]:
+    """Load the digest cache, tolerating a missing or corrupt file."""
+    try:
+        cache = json.loads(HASH_CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_hash_cache(cache: dict[str, list]) -> None:
+    """Atomically persist the digest cache next to the STL exports."""
+    tmp = HASH_CACHE.with_suffix(".json.tmp")
+    try:
+        tmp.write_text(json.dumps(cache, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, HASH_CACHE)
+    except OSError:
+        pass  # the cache is purely an optimisation
+
+
+def _warn_if_unaccelerated() -> None:
+    """Warn when SHA-256 is not backed by OpenSSL's accelerated code.
+
+    OpenSSL dispatches to SHA-NI/AVX on modern CPUs; CPython's bundled
+    ``_sha256`` fallback is several times slower, which matters once the
+    STL set grows. The check is advisory so odd Python builds still run.
+    """
+    if type(hashlib.sha256()).__module__ != "_hashlib":
+        print(
+            "warning: hashlib.sha256 is not OpenSSL-backed; "
+            "STL hashing will be slow",
+            file=sys.stderr,
+        )
+
+
+def run_build() -> None:
+    """Regenerate the STL exports from their OpenSCAD sources."""
+    subprocess.run(["bash", "scripts/build_stl.sh"], check=True, cwd=REPO_ROOT)
+
+
+def _iter_stls(root: Path):
+    """Yield ``(absolute path, stat result)`` for every STL under *root*.
+
+    Walks with ``os.scandir`` so each entry's stat comes for free from
+    the directory listing instead of a second syscall per file.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".stl") and entry.is_file():
+                    yield entry.path, entry.stat()
+
+
+def _hash_one(job: tuple[str, str]) -> tuple[str, str]:
+    """Return ``(relative path, hex digest)`` for one ``(rel, path)`` job.
+
+    The file is streamed through the digest in fixed-size chunks rather
+    than materialised with ``read_bytes``, keeping peak memory bounded
+    regardless of how large an exported STL grows.
+    """
+    rel, path = job
+    with open(path, "rb", buffering=0) as handle:
+        try:
+            # Tell the kernel we will read the whole file sequentially so
+            # readahead keeps the device busy while SHA-256 crunches the
+            # previous chunk (no-op on platforms without posix_fadvise).
+            os.posix_fadvise(handle.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except (AttributeError, OSError):
+            pass
+        digest = hashlib.file_digest(handle, "sha256").hexdigest()
+    return rel, digest
+
+
+def compute_checksums() -> dict[str, str]:
+    """Hash every STL under ``STL_DIR`` in parallel.
+
+    SHA-256 releases the GIL inside OpenSSL, so a thread pool gives
+    near-linear speedup on multi-core CI runners while keeping the
+    manifest order deterministic via a final sort.
+    """
+    root = str(STL_DIR)
+    cache = _load_hash_cache()
+    fresh: dict[str, list] = {}
+    results: list[tuple[str, str]] = []
+    to_hash: list[tuple[str, str]] = []
+    for path, stat in _iter_stls(STL_DIR):
+        rel = os.path.relpath(path, root).replace(os.sep, "/")
+        entry = cache.get(rel)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            fresh[rel] = entry
+            results.append((rel, entry[2]))
+        else:
+            fresh[rel] = [stat.st_mtime_ns, stat.st_size]
+            to_hash.append((rel, path))
+    if to_hash:
+        # Threads suffice while OpenSSL's sha256 releases the GIL; fall
+        # back to processes for unaccelerated builds (or when forced via
+        # STL_HASH_PROCESSES=1), where hashing would serialise on the GIL.
+        use_processes = os.environ.get("STL_HASH_PROCESSES") == "1" or (
+            type(hashlib.sha256()).__module__ != "_hashlib"
+        )
+        executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        workers = min(len(to_hash), os.cpu_count() or 1)
+        with executor_cls(max_workers=workers) as executor:
+            for rel, digest in executor.map(_hash_one, to_hash):
+                fresh[rel].append(digest)
+                results.append((rel, digest))
+    if not results:
+        return {}
+    _save_hash_cache(fresh)
+    return dict(sorted(results))
+
+
+def _parse_manifest(raw: bytes):
+    """Yield ``(relative path, digest)`` pairs from raw manifest bytes."""
+    for line in raw.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        digest, _, name = line.partition(b"  ")
+        if not digest or not name:
+            raise SystemExit(f"malformed manifest line: {line!r}")
+        yield name.decode("utf-8"), digest.decode("ascii")
+
+
+def read_manifest() -> dict[str, str]:
+    """Parse ``checksums.sha256`` into a mapping of relative path -> digest."""
+    if not MANIFEST.is_file():
+        raise SystemExit(f"missing checksum manifest: {MANIFEST}")
+    return dict(_parse_manifest(MANIFEST.read_bytes()))
+
+
+def write_manifest(checksums: dict[str, str]) -> None:
+    """Regenerate the manifest in ``sha256sum`` format with one write."""
+    lines = [f"{digest}  {name}\n" for name, digest in sorted(checksums.items())]
+    MANIFEST.write_text("".join(lines), encoding="utf-8")
+
+
+def main(argv: list[str] | None = None) -> int:
+    update = "--update" in (sys.argv[1:] if argv is None else argv)
+    _warn_if_unaccelerated()
+    inputs_digest = _build_inputs_digest()
+    try:
+        stamp = BUILD_STAMP.read_text(encoding="utf-8").strip()
+    except OSError:
+        stamp = ""
+    if stamp == inputs_digest:
+        print("build inputs unchanged, skipping STL rebuild")
+    else:
+        run_build()
+        STL_DIR.mkdir(parents=True, exist_ok=True)
+        BUILD_STAMP.write_text(inputs_digest + "\n", encoding="utf-8")
+    actual = compute_checksums()
+    if update:
+        write_manifest(actual)
+        print(f"wrote {len(actual)} STL checksum(s) to {MANIFEST.name}")
+        return 0
+    if not MANIFEST.is_file():
+        raise SystemExit(f"missing checksum manifest: {MANIFEST}")
+    # Stream the manifest against the freshly computed digests: each
+    # entry is popped as it is checked, so there is never a second full
+    # "expected" dict in memory and the drift buckets fall out of one pass.
+    remaining = dict(actual)
+    missing: list[str] = []
+    changed: list[str] = []
+    for name, digest in _parse_manifest(MANIFEST.read_bytes()):
+        current = remaining.pop(name, None)
+        if current is None:
+            missing.append(name)
+        elif current != digest:
+            changed.append(name)
+    extra = sorted(remaining)
+    missing.sort()
+    changed.sort()
+    if missing or extra or changed:
+        for name in missing:
+            print(f"missing STL: {name}", file=sys.stderr)
+        for name in extra:
+            print(f"unexpected STL: {name}", file=sys.stderr)
+        for name in changed:
+            print(f"checksum mismatch: {name}", file=sys.stderr)
+        return 1
+    print(f"verified {len(actual)} STL checksum(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
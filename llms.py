@@ -0,0 +1,58 @@
+"""CLI shim over :mod:`sigma._llms_parser`.
+
+The parsing lives in ``sigma/_llms_parser.py`` so every consumer shares
+one implementation (and one warm parse cache); this module keeps the
+historical ``import llms`` / ``python llms.py`` entry point working.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from sigma._llms_parser import (  # noqa: F401  (re-exported API)
+    DEFAULT_LLMS_PATH,
+    _load,
+    get_llm_endpoints,
+    resolve_llm_endpoint,
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="List or resolve LLM endpoints")
+    parser.add_argument("name", nargs="?", help="endpoint name to resolve")
+    parser.add_argument("--path", help="path to an alternative llms.txt")
+    parser.add_argument(
+        "--json", action="store_true", help="emit the listing as JSON"
+    )
+    namespace = parser.parse_args(argv)
+
+    endpoints, lookup, default_entry = _load(namespace.path)
+
+    if namespace.name:
+        entry = lookup.get(namespace.name.strip().casefold())
+        if entry is None:
+            raise RuntimeError(f"unknown LLM endpoint: {namespace.name}")
+        print(entry[1])
+        return 0
+    if namespace.json:
+        payload = [
+            {
+                "name": entry_name,
+                "url": url,
+                "default": (entry_name, url) == default_entry,
+            }
+            for entry_name, url in endpoints
+        ]
+        json.dump(payload, sys.stdout, indent=2)
+        print()
+    else:
+        for entry_name, url in endpoints:
+            marker = " (default)" if (entry_name, url) == default_entry else ""
+            print(f"{entry_name}: {url}{marker}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
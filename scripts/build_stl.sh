@@ -0,0 +1,12 @@
+#!/usr/bin/env bash
+# Export every OpenSCAD source under hardware/ to hardware/stl/.
+set -euo pipefail
+
+cd "$(dirname "$0")/.."
+mkdir -p hardware/stl
+
+shopt -s nullglob globstar
+for scad in hardware/**/*.scad; do
+    out="hardware/stl/$(basename "${scad%.scad}").stl"
+    openscad -o "$out" "$scad"
+done
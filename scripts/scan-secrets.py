@@ -0,0 +1,185 @@
+"""Scan a git diff for secrets before they land in the repository.
+
+Reads a unified diff on stdin and flags added lines that contain
+credential-shaped strings: known token formats first, then a Shannon
+entropy check over base64-ish runs. Lines carrying the allowlist token
+are skipped so deliberate fixtures can opt out.
+
+Usage: ``git diff | python scripts/scan-secrets.py [--json]``
+Exits non-zero when anything suspicious is found.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable
+
+ALLOWLIST_TOKEN = "scan-secrets: allow"
+_LOG2E = 1.4426950408889634  # 1 / ln(2)
+ENTROPY_THRESHOLD = 4.0
+MIN_CANDIDATE_LENGTH = 20
+
+_RULES: tuple[tuple[str, str], ...] = (
+    ("aws-access-key-id", r"(?:AKIA|ASIA)[0-9A-Z]{16}"),
+    ("github-token", r"gh[pousr]_[0-9A-Za-z]{36,}"),
+    ("gitlab-pat", r"glpat-[0-9A-Za-z\-]{20,}"),
+    ("slack-token", r"xox[baprs]-[0-9A-Za-z-]{10,}"),
+    ("stripe-secret-key", r"sk_live_[0-9A-Za-z]{16,}"),
+    ("openai-api-key", r"sk-[0-9A-Za-z]{20}T3BlbkFJ[0-9A-Za-z]{20}"),
+    ("google-api-key", r"AIza[0-9A-Za-z\-_]{35}"),
+    ("sendgrid-api-key", r"SG\.[0-9A-Za-z\-_]{22}\.[0-9A-Za-z\-_]{43}"),
+    (
+        "private-key-block",
+        r"-----BEGIN (?:RSA |EC |OPENSSH |DSA |PGP )?PRIVATE KEY(?: BLOCK)?-----",
+    ),
+    ("jwt", r"eyJ[0-9A-Za-z_-]{10,}\.[0-9A-Za-z_-]{10,}\.[0-9A-Za-z_-]{10,}"),
+)
+
+# All rules fuse into one alternation so each line costs a single regex
+# walk; the named group that fired maps back to the human-readable rule.
+# Compilation is deferred to first use so importing the module for one
+# helper (e.g. _shannon_entropy) stays cheap.
+_GROUP_TO_RULE = {name.replace("-", "_"): name for name, _ in _RULES}
+
+
+@lru_cache(maxsize=1)
+def _union_pattern() -> re.Pattern[str]:
+    return re.compile(
+        "|".join(
+            f"(?P<{name.replace('-', '_')}>{pattern})" for name, pattern in _RULES
+        )
+    )
+
+_CANDIDATE_RE = re.compile(r"[A-Za-z0-9+/=_\-]{%d,}" % MIN_CANDIDATE_LENGTH)
+
+# Optional Aho-Corasick prefilter: every rule anchors on one of these
+# literal prefixes, so a line with no automaton hit can skip the regex
+# entirely. pyahocorasick is optional; without it every line runs the
+# (still single) union search.
+_PREFIXES = (
+    "AKIA", "ASIA", "ghp_", "gho_", "ghu_", "ghs_", "ghr_", "glpat-",
+    "xox", "sk_live_", "sk-", "AIza", "SG.", "-----BEGIN", "eyJ",
+)
+try:
+    import ahocorasick  # type: ignore[import-not-found]
+except ImportError:
+    _PREFILTER = None
+else:  # pragma: no cover - exercised only when pyahocorasick is installed
+    _PREFILTER = ahocorasick.Automaton()
+    for _prefix in _PREFIXES:
+        _PREFILTER.add_word(_prefix, _prefix)
+    _PREFILTER.make_automaton()
+
+
+@dataclass(slots=True, frozen=True)
+class Finding:
+    line_no: int
+    rule: str
+    value: str
+    line: str
+
+
+_FIELDS = ("line_no", "rule", "value", "line")
+
+
+@lru_cache(maxsize=4096)
+def _shannon_entropy(value: str) -> float:
+    """Shannon entropy of *value* in bits per character.
+
+    Uses a 256-slot byte histogram and one ``math.log`` per distinct
+    byte (at most 64 for base64 text) rather than a log call per
+    character, folding the base-2 conversion into a final multiply.
+    """
+    data = value.encode("latin1", "replace")
+    total = len(data)
+    if not total:
+        return 0.0
+    histogram = [0] * 256
+    for byte in data:
+        histogram[byte] += 1
+    accumulator = 0.0
+    for count in histogram:
+        if count:
+            accumulator -= count * math.log(count / total)
+    return accumulator * _LOG2E / total
+
+
+# Entropy >= N bits/char needs at least 2**N distinct symbols, so a
+# cheap C-level set() size check rejects repetitive runs outright.
+_MIN_DISTINCT = 2 ** int(ENTROPY_THRESHOLD)
+
+
+def _detect_high_entropy_values(line: str) -> list[str]:
+    """Return base64-ish runs in *line* whose entropy crosses the bar."""
+    return [
+        value
+        for value in _CANDIDATE_RE.findall(line)
+        if len(set(value)) >= _MIN_DISTINCT
+        and _shannon_entropy(value) >= ENTROPY_THRESHOLD
+    ]
+
+
+def scan_diff(diff: str | Iterable[tuple[int, str]]) -> list[Finding]:
+    """Scan the added lines of a unified diff for secrets.
+
+    Accepts either the whole diff as a string or an iterable of
+    ``(line number, line)`` pairs, so large CI diffs can be streamed
+    straight off stdin without being materialised twice.
+    """
+    if isinstance(diff, str):
+        numbered = enumerate(diff.splitlines(), start=1)
+    else:
+        numbered = iter(diff)
+    union = _union_pattern()
+    findings: list[Finding] = []
+    for idx, raw_line in numbered:
+        raw_line = raw_line.rstrip("\n")
+        if not raw_line.startswith("+") or raw_line.startswith("+++"):
+            continue
+        line = raw_line[1:]
+        if ALLOWLIST_TOKEN in line:
+            continue
+        match = None
+        if _PREFILTER is None or next(_PREFILTER.iter(line), None) is not None:
+            match = union.search(line)
+        if match:
+            findings.append(
+                Finding(idx, _GROUP_TO_RULE[match.lastgroup], match.group(0), line.strip())
+            )
+            continue
+        values = _detect_high_entropy_values(line)
+        if values:
+            stripped = line.strip()
+            findings.extend(
+                Finding(idx, "high-entropy-string", value, stripped)
+                for value in values
+            )
+    return findings
+
+
+def main(argv: list[str] | None = None) -> int:
+    as_json = "--json" in (sys.argv[1:] if argv is None else argv)
+    findings = scan_diff(enumerate(sys.stdin, start=1))
+    if as_json:
+        payload = [
+            dict(zip(_FIELDS, (f.line_no, f.rule, f.value, f.line)))
+            for f in findings
+        ]
+        json.dump(payload, sys.stdout, indent=2)
+        print()
+    else:
+        for finding in findings:
+            print(
+                f"line {finding.line_no}: {finding.rule}: {finding.line}",
+                file=sys.stderr,
+            )
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
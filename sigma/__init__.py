@@ -0,0 +1,40 @@
+"""Helper package for the sigma AI pin.
+
+Submodules are imported lazily (PEP 562): ``import sigma`` loads only
+this file, and each exported name pulls in its module on first access.
+That keeps cold start cheap for CLI users who touch one helper.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_LAZY = {
+    "ConversationResult": "sigma.conversation",
+    "LLMResponse": "sigma.llm_client",
+    "TranscriptionResult": "sigma.whisper_client",
+    "clamp": "sigma.utils",
+    "get_llm_endpoints": "sigma._llms_parser",
+    "query_llm": "sigma.llm_client",
+    "resolve_llm_endpoint": "sigma._llms_parser",
+    "run_conversation": "sigma.conversation",
+    "run_conversation_async": "sigma.conversation",
+    "synthesize_speech": "sigma.tts",
+    "transcribe_audio": "sigma.whisper_client",
+}
+
+__all__ = sorted(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # cache so later accesses skip this hook
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,252 @@
+"""Canonical parser for the repository's ``llms.txt`` endpoint index.
+
+``llms.txt`` is a small markdown file whose ``## LLM Endpoints`` section
+lists the endpoints sigma can talk to as bullet links.  The first entry
+is the default.  Everything that needs the entries — the ``llms.py``
+CLI shim and the ``sigma`` package — imports this one implementation so
+the parser exists (and warms its cache) exactly once per process.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+DEFAULT_LLMS_PATH = Path(__file__).resolve().parents[1] / "llms.txt"
+
+_SECTION_TITLE = b"llm endpoints"
+
+# Parsed entries per file, keyed by path and invalidated when the file's
+# mtime or size changes, so repeated lookups in one process parse once.
+_PARSE_CACHE: dict[str, tuple[int, int, list[tuple[str, str]]]] = {}
+
+
+def _scan_endpoints_impl(buf: bytes) -> list[tuple[int, int, int, int]]:
+    """Scan a whole ``llms.txt`` buffer for endpoint link spans.
+
+    Returns ``(name_start, name_end, url_start, url_end)`` offsets so the
+    caller can decode just the matched slices.  Written against plain
+    integer indexing only, so Numba can JIT-compile it unchanged when
+    available; semantics mirror the line loop in ``get_llm_endpoints``.
+    """
+    # "llm endpoints" as byte codes, kept inline for Numba's benefit.
+    title_codes = (108, 108, 109, 32, 101, 110, 100, 112, 111, 105, 110, 116, 115)
+    spans: list[tuple[int, int, int, int]] = []
+    n = len(buf)
+    i = 0
+    in_section = False
+    while i < n:
+        j = i
+        while j < n and buf[j] != 0x0A:
+            j += 1
+        s, e = i, j
+        while s < e and (buf[s] == 0x20 or buf[s] == 0x09 or buf[s] == 0x0D):
+            s += 1
+        while e > s and (
+            buf[e - 1] == 0x20 or buf[e - 1] == 0x09 or buf[e - 1] == 0x0D
+        ):
+            e -= 1
+        i = j + 1
+        if s == e:
+            continue
+        first = buf[s]
+        if first == 0x23:  # "#"
+            if in_section and spans:
+                break
+            level = 0
+            while s < e and buf[s] == 0x23:
+                s += 1
+                level += 1
+            while s < e and (buf[s] == 0x20 or buf[s] == 0x09):
+                s += 1
+            while e > s and (buf[e - 1] == 0x20 or buf[e - 1] == 0x09):
+                e -= 1
+            while e > s and buf[e - 1] == 0x23:
+                e -= 1
+            while e > s and (buf[e - 1] == 0x20 or buf[e - 1] == 0x09):
+                e -= 1
+            matched = level == 2 and e - s == 13
+            if matched:
+                for k in range(13):
+                    char = buf[s + k]
+                    if 0x41 <= char <= 0x5A:
+                        char += 0x20
+                    if char != title_codes[k]:
+                        matched = False
+                        break
+            in_section = matched
+            continue
+        if not in_section or (first != 0x2D and first != 0x2A and first != 0x2B):
+            continue
+        # Locate "[name](url)", allowing nested parens inside the URL.
+        k = s
+        while k < e and buf[k] != 0x5B:  # "["
+            k += 1
+        if k == e:
+            continue
+        name_start = k + 1
+        k = name_start
+        while k < e - 1 and not (buf[k] == 0x5D and buf[k + 1] == 0x28):  # "]("
+            k += 1
+        if k >= e - 1:
+            continue
+        name_end = k
+        url_start = k + 2
+        depth = 1
+        url_end = -1
+        k = url_start
+        while k < e:
+            char = buf[k]
+            if char == 0x28:
+                depth += 1
+            elif char == 0x29:
+                depth -= 1
+                if depth == 0:
+                    url_end = k
+                    break
+            k += 1
+        if url_end <= url_start or name_end <= name_start:
+            continue
+        # URL must start with http:// or https:// (case-insensitive).
+        prefix_ok = False
+        m = url_start
+        if url_end - m >= 7:
+            h0 = buf[m] | 0x20
+            h1 = buf[m + 1] | 0x20
+            h2 = buf[m + 2] | 0x20
+            h3 = buf[m + 3] | 0x20
+            if h0 == 0x68 and h1 == 0x74 and h2 == 0x74 and h3 == 0x70:
+                m += 4
+                if buf[m] | 0x20 == 0x73:  # optional "s"
+                    m += 1
+                if (
+                    url_end - m >= 3
+                    and buf[m] == 0x3A
+                    and buf[m + 1] == 0x2F
+                    and buf[m + 2] == 0x2F
+                ):
+                    prefix_ok = True
+        if prefix_ok:
+            spans.append((name_start, name_end, url_start, url_end))
+    return spans
+
+
+try:  # optional: JIT the scanner for unusually large aggregated configs
+    from numba import njit  # type: ignore[import-not-found]
+except ImportError:
+    _scan_endpoints = None
+else:  # pragma: no cover - exercised only when numba is installed
+    _scan_endpoints = njit(cache=True)(_scan_endpoints_impl)
+
+
+def _parse_markdown_link(text: bytes) -> tuple[bytes, bytes] | None:
+    """Parse ``[name](url)`` from a bullet line, allowing parens in the URL."""
+    open_bracket = text.find(b"[")
+    if open_bracket == -1:
+        return None
+    close_bracket = text.find(b"](", open_bracket)
+    if close_bracket == -1:
+        return None
+    name = text[open_bracket + 1 : close_bracket]
+    url_start = close_bracket + 2
+    # Fast path: endpoint URLs almost never contain parentheses, so two
+    # C-level finds usually settle it without the per-character loop.
+    close_paren = text.find(b")", url_start)
+    if close_paren != -1 and text.find(b"(", url_start, close_paren) == -1:
+        url = text[url_start:close_paren]
+        if name and url:
+            return name, url
+        return None
+    depth = 1
+    for index in range(url_start, len(text)):
+        char = text[index]
+        if char == 0x28:  # "("
+            depth += 1
+        elif char == 0x29:  # ")"
+            depth -= 1
+            if depth == 0:
+                url = text[url_start:index]
+                if name and url:
+                    return name, url
+                return None
+    return None
+
+
+def get_llm_endpoints(path: str | Path | None = None) -> list[tuple[str, str]]:
+    """Return ``(name, url)`` pairs from the ``## LLM Endpoints`` section."""
+    llms_path = Path(path) if path is not None else DEFAULT_LLMS_PATH
+    cache_key = str(llms_path)
+    stat = llms_path.stat()
+    cached = _PARSE_CACHE.get(cache_key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return list(cached[2])
+    endpoints: list[tuple[str, str]] = []
+    in_section = False
+    data = llms_path.read_bytes()
+    if _scan_endpoints is not None:
+        endpoints = [
+            (data[ns:ne].decode("utf-8"), data[us:ue].decode("utf-8"))
+            for ns, ne, us, ue in _scan_endpoints(data)
+        ]
+        _PARSE_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, endpoints)
+        return list(endpoints)
+    # The markers that matter ("#", "-", "[", ")") are all ASCII, so the
+    # file is scanned as bytes and only matched names/URLs are decoded.
+    for line in data.splitlines():
+        # First-byte gate: blank and prose lines (the vast majority) are
+        # rejected before any strip allocation happens.
+        if not line or line[0] not in b"#-*+":
+            continue
+        # The gate guarantees column 0 holds the marker, so no leading
+        # strip is needed; headings clean their tail below and the link
+        # parser is indifferent to trailing whitespace or CR.
+        if line[0] == 0x23:  # "#"
+            if in_section and endpoints:
+                # The endpoints section is behind us; nothing below this
+                # heading can add entries, so skip the rest of the file.
+                break
+            bare = line.lstrip(b"#")
+            level = len(line) - len(bare)
+            title = bare.strip().rstrip(b"#").strip()
+            # Length gate first: lower() allocates, and almost no heading
+            # is exactly as long as "llm endpoints".
+            in_section = (
+                level == 2
+                and len(title) == len(_SECTION_TITLE)
+                and title.lower() == _SECTION_TITLE
+            )
+            continue
+        if not in_section:
+            continue
+        link = _parse_markdown_link(line)
+        if link and link[1].lower().startswith((b"http://", b"https://")):
+            endpoints.append((link[0].decode("utf-8"), link[1].decode("utf-8")))
+    _PARSE_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, endpoints)
+    return list(endpoints)
+
+
+def _load(
+    path: str | Path | None,
+) -> tuple[list[tuple[str, str]], dict[str, tuple[str, str]], tuple[str, str]]:
+    """Parse once and return ``(endpoints, lookup by folded name, default)``."""
+    endpoints = get_llm_endpoints(path)
+    if not endpoints:
+        raise RuntimeError("llms.txt does not list any LLM endpoints")
+    lookup: dict[str, tuple[str, str]] = {}
+    for entry in endpoints:
+        lookup.setdefault(entry[0].casefold(), entry)
+    return endpoints, lookup, endpoints[0]
+
+
+def resolve_llm_endpoint(
+    name: str | None = None, *, path: str | Path | None = None
+) -> tuple[str, str]:
+    """Resolve an endpoint by name, or the default (first) entry."""
+    _, lookup, default_entry = _load(path)
+    if name is None:
+        return default_entry
+    entry = lookup.get(name.strip().casefold())
+    if entry is None:
+        raise RuntimeError(f"unknown LLM endpoint: {name}")
+    return entry
+
+
@@ -0,0 +1,105 @@
+"""Optional cosine-similarity backend for the semantic response cache.
+
+``CosineSemanticCache`` implements the :class:`sigma.llm_client.SemanticCache`
+protocol over caller-supplied embeddings. The top-1 search runs through a
+Numba-JITted kernel when ``numba`` is importable (``pip install
+sigma[fastcache]``), a NumPy matmul otherwise; both extras are optional
+and nothing in this module is imported on the mainline query path.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
+
+def _cosine_top1_impl(matrix, query, threshold):
+    """Return (row, score) of the best row whose dot product beats threshold.
+
+    Rows and the query are expected to be L2-normalised float32, so the
+    dot product is the cosine similarity. Written against plain loops so
+    Numba can compile it; only ever called through the jitted wrapper.
+    """
+    best = -1
+    best_score = threshold
+    for i in range(matrix.shape[0]):
+        score = 0.0
+        for j in range(matrix.shape[1]):
+            score += matrix[i, j] * query[j]
+        if score >= best_score:
+            best_score = score
+            best = i
+    return best, best_score
+
+
+if njit is not None:  # pragma: no cover - requires the optional extra
+    # cache=True persists the compiled kernel so the first-call JIT cost
+    # is paid once per machine, not once per process.
+    _cosine_top1 = njit(cache=True, fastmath=True)(_cosine_top1_impl)
+elif np is not None:
+
+    def _cosine_top1(matrix, query, threshold):
+        scores = matrix @ query
+        best = int(scores.argmax())
+        best_score = float(scores[best])
+        if best_score >= threshold:
+            return best, best_score
+        return -1, threshold
+
+else:
+    _cosine_top1 = None
+
+
+class CosineSemanticCache:
+    """Match paraphrased prompts by cosine similarity of their embeddings.
+
+    *embed* maps a prompt to a 1-D embedding vector; entries whose
+    similarity to the query reaches *threshold* are treated as hits.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], Any],
+        *,
+        threshold: float = 0.82,
+    ) -> None:
+        if np is None:
+            raise RuntimeError(
+                "CosineSemanticCache requires numpy; install sigma[fastcache]"
+            )
+        self._embed = embed
+        self._threshold = threshold
+        self._matrix = None  # stacked L2-normalised float32 rows
+        self._responses: list[Any] = []
+
+    def _vector(self, prompt: str):
+        vector = np.asarray(self._embed(prompt), dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        if norm:
+            vector = vector / norm
+        return vector
+
+    def get(self, prompt: str) -> Any | None:
+        if self._matrix is None:
+            return None
+        best, _ = _cosine_top1(self._matrix, self._vector(prompt), self._threshold)
+        if best < 0:
+            return None
+        return self._responses[best]
+
+    def set(self, prompt: str, response: Any) -> None:
+        row = self._vector(prompt)[np.newaxis, :]
+        if self._matrix is None:
+            self._matrix = row
+        else:
+            self._matrix = np.vstack((self._matrix, row))
+        self._responses.append(response)
@@ -0,0 +1,203 @@
+"""End-to-end push-to-talk conversation pipeline.
+
+``run_conversation`` chains the three stages — whisper transcription,
+LLM query, speech synthesis — and optionally writes the reply audio to
+disk. ``run_conversation_async`` is the coroutine flavour for callers
+that drive several conversations concurrently (batch evaluation, a
+server handling overlapping sessions).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+
+from sigma.llm_client import DEFAULT_TIMEOUT as DEFAULT_LLM_TIMEOUT
+from sigma.llm_client import LLMResponse, query_llm
+from sigma.tts import DEFAULT_TIMEOUT as DEFAULT_TTS_TIMEOUT
+from sigma.tts import synthesize_speech
+from sigma.whisper_client import DEFAULT_TIMEOUT as DEFAULT_WHISPER_TIMEOUT
+from sigma.whisper_client import TranscriptionResult, transcribe_audio
+
+DEFAULT_PROMPT_TEMPLATE = "{transcript}"
+
+# Common templates resolved without str.format's parse loop; the default
+# template is the overwhelming majority of calls.
+_FAST_TEMPLATES = {
+    "{transcript}": lambda transcript, language: transcript,
+    "{language}: {transcript}": lambda transcript, language: (
+        f"{language}: {transcript}"
+    ),
+}
+
+
+def _render_prompt(prompt_template: str, transcript: TranscriptionResult) -> str:
+    fast = _FAST_TEMPLATES.get(prompt_template)
+    if fast is not None:
+        return fast(transcript.text, transcript.language or "")
+    return prompt_template.format(
+        transcript=transcript.text, language=transcript.language or ""
+    )
+
+
+@dataclass(frozen=True)
+class ConversationResult:
+    """Everything produced by one conversation turn."""
+
+    transcript: TranscriptionResult
+    prompt: str
+    response: LLMResponse
+    audio: bytes | None
+    output_path: Path | None
+
+
+def run_conversation(
+    audio_path: str | os.PathLike[str],
+    *,
+    output_path: str | os.PathLike[str] | None = None,
+    prompt_template: str = DEFAULT_PROMPT_TEMPLATE,
+    llm_name: str | None = None,
+    llm_path: str | os.PathLike[str] | None = None,
+    llm_timeout: float = DEFAULT_LLM_TIMEOUT,
+    llm_extra_payload: Mapping[str, Any] | None = None,
+    whisper_url: str | None = None,
+    whisper_model: str | None = None,
+    whisper_language: str | None = None,
+    whisper_temperature: float | None = None,
+    whisper_extra_params: Mapping[str, Any] | None = None,
+    whisper_timeout: float = DEFAULT_WHISPER_TIMEOUT,
+    synthesize: bool = True,
+    tts_url: str | None = None,
+    tts_voice: str | None = None,
+    tts_timeout: float = DEFAULT_TTS_TIMEOUT,
+) -> ConversationResult:
+    """Run one audio-in / audio-out conversation turn."""
+    # Normalise path-likes once; the helpers downstream take plain strings.
+    llm_path_str = os.fspath(llm_path) if llm_path is not None else None
+    destination = Path(output_path) if output_path is not None else None
+    transcribe_kwargs: dict[str, Any] = {
+        "timeout": whisper_timeout,
+        **{
+            key: value
+            for key, value in (
+                ("url", whisper_url),
+                ("model", whisper_model),
+                ("language", whisper_language),
+                ("temperature", whisper_temperature),
+                ("extra_params", whisper_extra_params),
+            )
+            if value is not None
+        },
+    }
+    transcript = transcribe_audio(audio_path, **transcribe_kwargs)
+
+    prompt = _render_prompt(prompt_template, transcript)
+
+    response = query_llm(
+        prompt,
+        llm_name,
+        path=llm_path_str,
+        timeout=llm_timeout,
+        extra_payload=llm_extra_payload,
+    )
+
+    audio: bytes | None = None
+    written: Path | None = None
+    if synthesize and response.text:
+        audio = synthesize_speech(
+            response.text, url=tts_url, voice=tts_voice, timeout=tts_timeout
+        )
+        if destination is not None:
+            destination.write_bytes(audio)
+            written = destination
+
+    return ConversationResult(
+        transcript=transcript,
+        prompt=prompt,
+        response=response,
+        audio=audio,
+        output_path=written,
+    )
+
+
+async def run_conversation_async(
+    audio_path: str | os.PathLike[str],
+    *,
+    output_path: str | os.PathLike[str] | None = None,
+    prompt_template: str = DEFAULT_PROMPT_TEMPLATE,
+    llm_name: str | None = None,
+    llm_path: str | os.PathLike[str] | None = None,
+    llm_timeout: float = DEFAULT_LLM_TIMEOUT,
+    llm_extra_payload: Mapping[str, Any] | None = None,
+    whisper_url: str | None = None,
+    whisper_model: str | None = None,
+    whisper_language: str | None = None,
+    whisper_temperature: float | None = None,
+    whisper_extra_params: Mapping[str, Any] | None = None,
+    whisper_timeout: float = DEFAULT_WHISPER_TIMEOUT,
+    synthesize: bool = True,
+    tts_url: str | None = None,
+    tts_voice: str | None = None,
+    tts_timeout: float = DEFAULT_TTS_TIMEOUT,
+) -> ConversationResult:
+    """Coroutine flavour of :func:`run_conversation`.
+
+    The stages stay causally ordered, but each blocking helper runs in a
+    worker thread so N conversations awaited together (``asyncio.gather``)
+    overlap their network and disk time instead of serialising on it.
+    """
+    llm_path_str = os.fspath(llm_path) if llm_path is not None else None
+    destination = Path(output_path) if output_path is not None else None
+    transcribe_kwargs: dict[str, Any] = {
+        "timeout": whisper_timeout,
+        **{
+            key: value
+            for key, value in (
+                ("url", whisper_url),
+                ("model", whisper_model),
+                ("language", whisper_language),
+                ("temperature", whisper_temperature),
+                ("extra_params", whisper_extra_params),
+            )
+            if value is not None
+        },
+    }
+    transcript = await asyncio.to_thread(
+        transcribe_audio, audio_path, **transcribe_kwargs
+    )
+
+    prompt = _render_prompt(prompt_template, transcript)
+
+    response = await asyncio.to_thread(
+        query_llm,
+        prompt,
+        llm_name,
+        path=llm_path_str,
+        timeout=llm_timeout,
+        extra_payload=llm_extra_payload,
+    )
+
+    audio: bytes | None = None
+    written: Path | None = None
+    if synthesize and response.text:
+        audio = await asyncio.to_thread(
+            synthesize_speech,
+            response.text,
+            url=tts_url,
+            voice=tts_voice,
+            timeout=tts_timeout,
+        )
+        if destination is not None:
+            await asyncio.to_thread(destination.write_bytes, audio)
+            written = destination
+
+    return ConversationResult(
+        transcript=transcript,
+        prompt=prompt,
+        response=response,
+        audio=audio,
+        output_path=written,
+    )
@@ -0,0 +1,79 @@
+"""Disk-backed, content-addressed cache for LLM responses.
+
+Records live as ``{sha256}.json`` files under the cache directory
+(``data/llm_cache`` by default). Keys hash the endpoint name, URL and
+serialised request body with an 8-byte length prefix per field, so two
+different field splits can never collide on the same digest. Each record
+carries UTC ``cachedAt``/``expiresAt`` stamps; expired entries are
+deleted on read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+DEFAULT_CACHE_DIR = Path("data") / "llm_cache"
+DEFAULT_TTL = 7 * 24 * 60 * 60  # seconds
+
+# Bump to invalidate every cached response after a prompt-format change.
+PROMPT_VERSION = b"1"
+
+
+def cache_key(name: str, url: str, body: bytes) -> str:
+    """Digest the request identity into a filesystem-safe key."""
+    digest = hashlib.sha256()
+    for field in (name.encode(), url.encode(), body, PROMPT_VERSION):
+        digest.update(len(field).to_bytes(8, "big"))
+        digest.update(field)
+    return digest.hexdigest()
+
+
+def _record_path(key: str, cache_dir: str | os.PathLike[str] | None) -> Path:
+    base = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    return base / f"{key}.json"
+
+
+def get(
+    key: str,
+    cache_dir: str | os.PathLike[str] | None = None,
+) -> dict[str, Any] | None:
+    """Return the cached record for *key*, or None if absent or expired."""
+    path = _record_path(key, cache_dir)
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        record = json.loads(raw)
+    except ValueError:
+        return None
+    expires_at = record.get("expiresAt")
+    if isinstance(expires_at, (int, float)) and expires_at <= time.time():
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        return None
+    return record
+
+
+def set(
+    key: str,
+    record: dict[str, Any],
+    cache_dir: str | os.PathLike[str] | None = None,
+    *,
+    ttl: float = DEFAULT_TTL,
+) -> None:
+    """Write *record* for *key*, stamping cachedAt/expiresAt."""
+    path = _record_path(key, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    now = time.time()
+    record = {**record, "cachedAt": now, "expiresAt": now + ttl}
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(record), encoding="utf-8")
+    os.replace(tmp, path)
@@ -0,0 +1,1040 @@
+"""Query the LLM endpoints listed in ``llms.txt`` over HTTP.
+
+``query_llm`` posts a JSON payload to the named (or default) endpoint
+and extracts the assistant text from whichever response shape the
+server speaks — Ollama's ``{"response": ...}``, OpenAI-style
+``choices``, or plain text. Doubles as a CLI:
+``python -m sigma.llm_client "prompt"``.
+"""
+
+from __future__ import annotations
+
+import functools
+import gzip
+import hashlib
+import http.client
+import io
+import json
+import os
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Protocol
+from urllib import error, parse, request
+
+from sigma._llms_parser import resolve_llm_endpoint
+
+try:  # pragma: no cover - exercised when urllib3 is installed
+    import urllib3
+except ImportError:  # pragma: no cover
+    urllib3 = None  # type: ignore[assignment]
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None  # type: ignore[assignment]
+
+# Both accept bytes; orjson parses them directly with SIMD UTF-8
+# validation instead of the decode-then-parse double pass.
+_loads = json.loads if orjson is None else orjson.loads
+
+
+def _dumps_std(payload: dict[str, Any]) -> bytes:
+    # Compact separators match orjson's output: no ", "/": " padding,
+    # which trims two bytes per entry off the wire and the encode.
+    return json.dumps(
+        payload, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+# orjson serialises straight to UTF-8 bytes, skipping the intermediate
+# str that the stdlib dumps + encode pair allocates.
+_dumps = _dumps_std if orjson is None else orjson.dumps
+
+DEFAULT_TIMEOUT = 30.0
+
+_AUTH_TOKEN_ENV = "SIGMA_LLM_AUTH_TOKEN"
+_AUTH_SCHEME_ENV = "SIGMA_LLM_AUTH_SCHEME"
+_CACHE_ENV = "SIGMA_LLM_CACHE"
+_SUPPORTED_SCHEMES = {"http", "https"}
+
+_UNSET = object()
+
+_ACCEPT_ENCODING = "zstd, gzip" if zstandard is not None else "gzip"
+
+_BASE_HEADERS: Mapping[str, str] = MappingProxyType(
+    {
+        "Content-Type": "application/json; charset=utf-8",
+        "Accept": "application/json, text/plain",
+        "Accept-Encoding": _ACCEPT_ENCODING,
+    }
+)
+
+# zstd frame magic; used to detect bodies a transport left compressed.
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _decompress(raw: bytes, content_encoding: str | None) -> bytes:
+    """Undo a Content-Encoding the transport did not decode itself."""
+    if not content_encoding:
+        return raw
+    encoding = content_encoding.lower()
+    if encoding == "gzip" and raw[:2] == b"\x1f\x8b":
+        return gzip.decompress(raw)
+    if (
+        encoding == "zstd"
+        and zstandard is not None
+        and raw[:4] == _ZSTD_MAGIC
+    ):
+        return zstandard.ZstdDecompressor().decompress(raw)
+    return raw
+
+
+@dataclass(frozen=True)
+class LLMResponse:
+    """Outcome of one LLM query."""
+
+    name: str
+    url: str
+    status: int
+    # The transport's native headers object (HTTPMessage or urllib3's
+    # HTTPHeaderDict); both are Mappings, neither is copied per call.
+    headers: Mapping[str, str]
+    raw: bytes
+    encoding: str
+    text: str | None
+    content_encoding: str | None = None
+    _parsed: Any = field(default=_UNSET, compare=False, repr=False)
+
+    def headers_dict(self) -> dict[str, str]:
+        """Materialise the headers as a plain dict (e.g. for serialising)."""
+        return dict(self.headers.items())
+
+    def json(self) -> Any:
+        """Parse the raw body as JSON.
+
+        The document query_llm already parsed is reused, so calling this
+        after a query is an attribute read, not a second parse.
+        """
+        parsed = self._parsed
+        if parsed is not _UNSET:
+            return parsed
+        if _looks_like_json(self.raw) and not _looks_complete_json(self.raw):
+            raise ValueError("response body is truncated JSON")
+        try:
+            parsed = _loads(self.raw)
+        except ValueError:
+            # Bodies in a non-UTF-8 charset need the declared decode.
+            decoded = self.raw.decode(self.encoding, errors="replace")
+            parsed = json.loads(decoded)
+        object.__setattr__(self, "_parsed", parsed)
+        return parsed
+
+
+class SemanticCache(Protocol):
+    """Optional second cache tier matching paraphrased prompts.
+
+    Any object with ``get(prompt)`` returning a prior :class:`LLMResponse`
+    (or ``None``) and ``set(prompt, response)`` qualifies — typically an
+    embedding index that matches on cosine similarity rather than equality.
+    """
+
+    def get(self, prompt: str) -> LLMResponse | None: ...
+
+    def set(self, prompt: str, response: LLMResponse) -> None: ...
+
+
+class _ExactCache:
+    """Small thread-safe LRU of responses keyed by endpoint + body hash."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, bytes], LLMResponse] = OrderedDict()
+
+    def get(self, key: tuple[str, bytes]) -> LLMResponse | None:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+
+    def set(self, key: tuple[str, bytes], response: LLMResponse) -> None:
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_RESPONSE_CACHE = _ExactCache()
+
+# Nagle off so small streamed chunks flush immediately, and a roomy
+# receive buffer so long completions don't stall the sender. Harmless on
+# endpoints that already buffer.
+_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_RCVBUF, 262144),
+]
+
+
+def _tune_socket(sock: socket.socket) -> None:
+    for level, option, value in _SOCKET_OPTIONS:
+        try:
+            sock.setsockopt(level, option, value)
+        except OSError:
+            pass  # e.g. SO_RCVBUF capped by the kernel
+
+
+class _TunedHTTPConnection(http.client.HTTPConnection):
+    def connect(self) -> None:
+        super().connect()
+        _tune_socket(self.sock)
+
+
+class _TunedHTTPSConnection(http.client.HTTPSConnection):
+    def connect(self) -> None:
+        super().connect()
+        _tune_socket(self.sock)
+
+
+class _TunedHTTPHandler(request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_TunedHTTPConnection, req)
+
+
+class _TunedHTTPSHandler(request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_TunedHTTPSConnection, req)
+
+
+_OPENER = request.build_opener(_TunedHTTPHandler, _TunedHTTPSHandler)
+
+# Lazily-built urllib3 pool so repeat calls to one endpoint reuse the
+# TCP/TLS connection instead of paying a fresh handshake per request.
+_POOL: Any = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool() -> Any:
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = urllib3.PoolManager(
+                    num_pools=8,
+                    maxsize=16,
+                    retries=urllib3.Retry(total=0),
+                    socket_options=_SOCKET_OPTIONS,
+                )
+    return _POOL
+
+
+def close_pool() -> None:
+    """Close the shared connection pool, if one was created."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.clear()
+            _POOL = None
+
+
+def _looks_like_json(raw: bytes) -> bool:
+    """True when the first non-whitespace byte opens a JSON container.
+
+    bytes.lstrip walks only the whitespace prefix in C and returns the
+    original object when there is nothing to strip, so the common
+    no-leading-whitespace case does no copying at all.
+    """
+    first = raw.lstrip(b" \t\r\n")[:1]
+    return first == b"{" or first == b"["
+
+
+# Bodies at least this large take the streaming extraction path when
+# ijson is installed, so the full object tree is never materialised.
+_STREAM_THRESHOLD = 256 * 1024
+
+# JSONPath-style prefixes for the text fields of the known shapes, in
+# the same priority order the generic extractor uses.
+_STREAM_PREFIXES = (
+    "response",
+    "choices.item.message.content",
+    "choices.item.text",
+    "choices.item.delta.content",
+)
+
+
+def _stream_extract_text(raw: bytes) -> str | None:
+    """Pull assistant text out of *raw* without building the full tree.
+
+    Walks the known response shapes with ijson's incremental parser;
+    returns None when no shape matches so the caller can fall back to
+    the ordinary full parse.
+    """
+    for prefix in _STREAM_PREFIXES:
+        buffer = io.StringIO()
+        try:
+            for item in ijson.items(io.BytesIO(raw), prefix):
+                if type(item) is str and item:
+                    buffer.write(item)
+        except (ijson.JSONError, ValueError):
+            return None
+        if buffer.tell():
+            return buffer.getvalue()
+    return None
+
+
+def _looks_complete_json(raw: bytes) -> bool:
+    """True when the last non-whitespace byte closes a JSON container.
+
+    A truncated body can never parse, so this one-byte check saves the
+    full C-level parse attempt (and its exception) on streamed or
+    cut-off payloads.
+    """
+    tail = raw.rstrip(b" \t\r\n")[-1:]
+    return tail == b"}" or tail == b"]"
+
+
+def _cache_enabled() -> bool:
+    return os.getenv(_CACHE_ENV, "").strip().lower() not in {"0", "off", "false"}
+
+
+def clear_response_cache() -> None:
+    """Drop every cached response (tests, prompt-template changes)."""
+    _RESPONSE_CACHE.clear()
+
+
+@functools.lru_cache(maxsize=4)
+def _auth_header_for(token: str | None, scheme: str | None) -> dict[str, str]:
+    if token is None:
+        return {}
+    token = token.strip()
+    if not token:
+        raise RuntimeError(f"{_AUTH_TOKEN_ENV} is set but empty")
+    scheme = (scheme or "Bearer").strip()
+    if not scheme:
+        return {"Authorization": token}
+    return {"Authorization": f"{scheme} {token}"}
+
+
+def _build_authorisation_header() -> dict[str, str]:
+    """Build the optional Authorization header from the environment.
+
+    The dict is memoised on the env-var values, so steady-state calls
+    cost two getenv lookups and one cache hit instead of string work.
+    """
+    return _auth_header_for(
+        os.getenv(_AUTH_TOKEN_ENV), os.getenv(_AUTH_SCHEME_ENV)
+    )
+
+
+_DEFAULT_HEADERS: Mapping[str, str] = _BASE_HEADERS
+_AUTH_ERROR: RuntimeError | None = None
+
+
+def refresh_auth() -> None:
+    """Re-read the auth env vars and rebuild the default headers.
+
+    Auth is snapshotted at import because the env vars are set at
+    process start in practice; call this after rotating the token. A
+    malformed token is remembered and surfaced on the next query rather
+    than failing the import.
+    """
+    global _DEFAULT_HEADERS, _AUTH_ERROR
+    try:
+        auth = _build_authorisation_header()
+    except RuntimeError as exc:
+        _DEFAULT_HEADERS = _BASE_HEADERS
+        _AUTH_ERROR = exc
+        return
+    _AUTH_ERROR = None
+    _DEFAULT_HEADERS = (
+        MappingProxyType({**_BASE_HEADERS, **auth}) if auth else _BASE_HEADERS
+    )
+
+
+refresh_auth()
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_cached(name: str | None, path: str | None) -> tuple[str, str]:
+    """Memoised endpoint lookup so steady-state calls skip the file stat."""
+    return resolve_llm_endpoint(name, path=path)
+
+
+@functools.lru_cache(maxsize=64)
+def _validated_url(url: str) -> str:
+    """Strip and scheme-check *url* once; repeat calls skip the parse."""
+    normalized = url.strip()
+    if parse.urlparse(normalized).scheme.lower() not in _SUPPORTED_SCHEMES:
+        raise RuntimeError(f"unsupported URL scheme for LLM endpoint: {url}")
+    return normalized
+
+
+@functools.lru_cache(maxsize=256)
+def _prepare_payload_cached(
+    prompt: str, frozen_extra: tuple[tuple[str, Any], ...] | None
+) -> bytes:
+    payload: dict[str, Any] = {"prompt": prompt}
+    if frozen_extra:
+        payload.update(frozen_extra)
+    try:
+        return _dumps(payload)
+    except (TypeError, ValueError) as exc:
+        raise RuntimeError("extra_payload contains non-serialisable values") from exc
+
+
+def _prepare_payload(
+    prompt: str, extra_payload: Mapping[str, Any] | None
+) -> bytes:
+    """Serialise the request body, merging any caller-supplied fields.
+
+    The encoded bytes are memoised per (prompt, extra_payload), so
+    retries and batch re-sends of the same prompt skip the serialiser;
+    bytes are immutable, making the shared result safe. Payloads with
+    unhashable values (nested dicts/lists) take the uncached path.
+    """
+    if extra_payload is None:
+        return _prepare_payload_cached(prompt, None)
+    try:
+        return _prepare_payload_cached(prompt, tuple(sorted(extra_payload.items())))
+    except TypeError:
+        pass
+    payload: dict[str, Any] = {"prompt": prompt, **extra_payload}
+    try:
+        return _dumps(payload)
+    except (TypeError, ValueError) as exc:
+        raise RuntimeError("extra_payload contains non-serialisable values") from exc
+
+
+_TEXT_KEYS = (
+    "response",
+    "text",
+    "content",
+    "output_text",
+    "generated_text",
+    "completion",
+    "generation",
+    "answer",
+    "reply",
+)
+_SEGMENT_KEYS = ("segments", "parts")
+_WRAPPER_KEYS = ("message", "delta", "data", "output", "result")
+
+_MISSING = object()
+
+# Keys whose string value can be returned as-is from a one-entry dict,
+# skipping the walker entirely.
+_DIRECT_TEXT_KEYS = frozenset(_TEXT_KEYS)
+
+# Walker frame kinds: a MAP frame returns its first truthy candidate, a
+# LIST frame concatenates every truthy item.
+_MAP, _LIST = 0, 1
+
+
+def _mapping_candidates(value: Mapping[str, Any]):
+    """Yield the sub-values of *value* to try, in priority order."""
+    for key in _TEXT_KEYS:
+        child = value.get(key, _MISSING)
+        if child is not _MISSING:
+            yield child
+    for key in _SEGMENT_KEYS:
+        child = value.get(key, _MISSING)
+        if type(child) is list:
+            yield child
+    for key in _WRAPPER_KEYS:
+        child = value.get(key, _MISSING)
+        if child is not _MISSING:
+            yield child
+
+
+def _extract_text_value(value: Any) -> str | None:
+    """Pull assistant text out of an arbitrarily nested response value.
+
+    Implemented as an explicit-stack walk rather than mutual recursion:
+    deep OpenAI-style payloads with many choices/content parts no longer
+    allocate a Python frame per nesting level. Semantics are unchanged —
+    mappings return their first truthy candidate (text keys, then
+    segment lists, then wrapper keys) and lists join their truthy items.
+    """
+    kind = type(value)
+    if kind is str:
+        return value or None
+    if kind is dict or isinstance(value, Mapping):
+        if len(value) == 1:
+            # One-entry leaves like {"text": "..."} are common deep in
+            # choices/content trees; answer them without a walker frame.
+            key, child = next(iter(value.items()))
+            if key in _DIRECT_TEXT_KEYS and type(child) is str:
+                return child or None
+        stack = [(_MAP, _mapping_candidates(value), None)]
+    elif kind is list:
+        stack = [(_LIST, iter(value), io.StringIO())]
+    elif isinstance(value, str):
+        return value or None
+    else:
+        return None
+
+    result: str | None = None
+    while stack:
+        frame_kind, candidates, buffer = stack[-1]
+        if result:
+            if frame_kind == _MAP:
+                # First truthy candidate wins; propagate it upward.
+                stack.pop()
+                continue
+            # StringIO appends in C; hundreds of streamed token chunks
+            # accumulate without list growth or a final join pass.
+            buffer.write(result)
+        result = None
+        child = next(candidates, _MISSING)
+        if child is _MISSING:
+            stack.pop()
+            if frame_kind == _LIST and buffer.tell():
+                result = buffer.getvalue()
+            continue
+        kind = type(child)
+        if kind is str:
+            result = child or None
+        elif kind is dict or isinstance(child, Mapping):
+            stack.append((_MAP, _mapping_candidates(child), None))
+        elif kind is list:
+            stack.append((_LIST, iter(child), io.StringIO()))
+        elif isinstance(child, str):
+            result = child or None
+    return result
+
+
+def _extract_text(data: Any) -> str | None:
+    """Extract the assistant text from a parsed response document."""
+    if type(data) is dict or isinstance(data, Mapping):
+        # Ollama-style {"response": ...} (and bare {"text": ...}) is the
+        # dominant shape here; answer it with one lookup before probing
+        # the OpenAI-style keys.
+        direct = data.get("response", _MISSING)
+        if direct is _MISSING:
+            direct = data.get("text", _MISSING)
+        if type(direct) is str and direct:
+            return direct
+        choices = data.get("choices")
+        if type(choices) is list:
+            found = _extract_text_value(choices)
+            if found:
+                return found
+        messages = data.get("messages")
+        if type(messages) is list:
+            for message in reversed(messages):
+                found = _extract_text_value(message)
+                if found:
+                    return found
+    return _extract_text_value(data)
+
+
+def _post_urllib(
+    url: str, body: bytes, headers: Mapping[str, str], timeout: float
+) -> tuple[bytes, int, Mapping[str, str], str, str, str | None]:
+    req = request.Request(url, data=body, headers=dict(headers), method="POST")
+    try:
+        with _OPENER.open(req, timeout=timeout) as response:
+            content_encoding = response.headers.get("Content-Encoding")
+            return (
+                _decompress(response.read(), content_encoding),
+                response.status,
+                response.headers,
+                response.headers.get_content_type(),
+                response.headers.get_content_charset() or "utf-8",
+                content_encoding,
+            )
+    except error.HTTPError as exc:
+        raise RuntimeError(
+            f"LLM endpoint returned HTTP {exc.code}: {exc.reason}"
+        ) from exc
+    except error.URLError as exc:
+        raise RuntimeError(
+            f"could not reach LLM endpoint {url}: {exc.reason}"
+        ) from exc
+
+
+def _post_urllib3(
+    url: str, body: bytes, headers: Mapping[str, str], timeout: float
+) -> tuple[bytes, int, Mapping[str, str], str, str, str | None]:
+    try:
+        response = _get_pool().request(
+            "POST",
+            url,
+            body=body,
+            headers=dict(headers),
+            timeout=urllib3.Timeout(total=timeout),
+            preload_content=True,
+        )
+    except urllib3.exceptions.HTTPError as exc:
+        raise RuntimeError(f"could not reach LLM endpoint {url}: {exc}") from exc
+    if response.status >= 400:
+        raise RuntimeError(
+            f"LLM endpoint returned HTTP {response.status}: {response.reason}"
+        )
+    response_headers = response.headers
+    content_type, _, params = response_headers.get("Content-Type", "").partition(";")
+    encoding = "utf-8"
+    for param in params.split(";"):
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "charset" and value:
+            encoding = value.strip('"')
+            break
+    # urllib3 decodes gzip/deflate itself; zstd may come through raw.
+    content_encoding = response.headers.get("Content-Encoding")
+    return (
+        _decompress(response.data, content_encoding),
+        response.status,
+        response_headers,
+        content_type.strip().lower() or "text/plain",
+        encoding,
+        content_encoding,
+    )
+
+
+_post = _post_urllib if urllib3 is None else _post_urllib3
+
+
+def _record_from_response(response: LLMResponse) -> dict[str, Any]:
+    import base64
+
+    return {
+        "name": response.name,
+        "url": response.url,
+        "encoding": response.encoding,
+        "raw": base64.b64encode(response.raw).decode("ascii"),
+        "text": response.text,
+    }
+
+
+def _response_from_record(record: dict[str, Any]) -> LLMResponse:
+    import base64
+
+    return LLMResponse(
+        name=record["name"],
+        url=record["url"],
+        status=200,
+        headers={"X-Cache": "HIT"},
+        raw=base64.b64decode(record["raw"]),
+        encoding=record.get("encoding") or "utf-8",
+        text=record.get("text"),
+    )
+
+
+def _extract_ollama(data: dict[str, Any]) -> str | None:
+    value = data.get("response")
+    if type(value) is str and value:
+        return value
+    return None
+
+
+def _extract_openai_chat(data: dict[str, Any]) -> str | None:
+    try:
+        choices = data["choices"]
+        if len(choices) != 1:  # multi-choice joins need the walker
+            return None
+        value = choices[0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        return None
+    if type(value) is str and value:
+        return value
+    return None
+
+
+def _extract_openai_text(data: dict[str, Any]) -> str | None:
+    try:
+        choices = data["choices"]
+        if len(choices) != 1:
+            return None
+        value = choices[0]["text"]
+    except (KeyError, IndexError, TypeError):
+        return None
+    if type(value) is str and value:
+        return value
+    return None
+
+
+def _extract_anthropic(data: dict[str, Any]) -> str | None:
+    content = data.get("content")
+    if type(content) is not list or not content:
+        return None
+    buffer = io.StringIO()
+    for block in content:
+        if type(block) is not dict:
+            return None
+        text = block.get("text")
+        if type(text) is str and text:
+            buffer.write(text)
+    if buffer.tell():
+        return buffer.getvalue()
+    return None
+
+
+# Straight-line extractors for the shapes endpoints actually return. An
+# endpoint's shape is stable in practice, so after one successful match
+# its extractor is cached by display name and later responses cost a
+# couple of pointer chases instead of the generic walk.
+_SPECIALISED_EXTRACTORS = (
+    _extract_ollama,
+    _extract_openai_chat,
+    _extract_openai_text,
+    _extract_anthropic,
+)
+_EXTRACTOR_CACHE: dict[str, Callable[[dict[str, Any]], str | None]] = {}
+
+
+def _extract_text_for(display_name: str, data: Any) -> str | None:
+    """Extract text via the endpoint's cached specialised extractor."""
+    if type(data) is dict:
+        specialised = _EXTRACTOR_CACHE.get(display_name)
+        if specialised is not None:
+            found = specialised(data)
+            if found is not None:
+                return found
+            # Shape changed; forget the specialisation and re-probe later.
+            _EXTRACTOR_CACHE.pop(display_name, None)
+        else:
+            for candidate in _SPECIALISED_EXTRACTORS:
+                found = candidate(data)
+                if found is not None:
+                    _EXTRACTOR_CACHE[display_name] = candidate
+                    return found
+    return _extract_text(data)
+
+
+def query_llm(
+    prompt: str,
+    name: str | None = None,
+    *,
+    path: str | os.PathLike[str] | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    extra_payload: Mapping[str, Any] | None = None,
+    use_cache: bool = True,
+    semantic_cache: SemanticCache | None = None,
+    refresh_endpoint: bool = False,
+    keep_raw: bool = True,
+    cache_dir: str | os.PathLike[str] | None = None,
+) -> LLMResponse:
+    """Send *prompt* to an endpoint from ``llms.txt`` and parse the reply.
+
+    Repeated identical prompts are answered from an in-process LRU
+    instead of re-querying the endpoint; pass ``use_cache=False`` (or set
+    ``SIGMA_LLM_CACHE=off``) to force a round-trip. *semantic_cache*, if
+    given, is consulted next and may match paraphrased prompts.
+    ``refresh_endpoint=True`` re-reads ``llms.txt`` after an edit.
+    ``keep_raw=False`` drops the body bytes from the result once the
+    text is extracted, halving peak memory for large responses;
+    ``json()`` still works on JSON replies via the pre-parsed document.
+    *cache_dir* additionally persists responses on disk (see
+    :mod:`sigma.llm_cache`), surviving process restarts; disk hits carry
+    a synthetic ``X-Cache: HIT`` header.
+    """
+    path_str = os.fspath(path) if path is not None else None
+    if refresh_endpoint:
+        _resolve_cached.cache_clear()
+    display_name, url = _resolve_cached(name, path_str)
+    normalized_url = _validated_url(url)
+
+    body = _prepare_payload(prompt, extra_payload)
+    caching = use_cache and _cache_enabled()
+    cache_key = (display_name, hashlib.sha256(body).digest())
+    if caching:
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        if semantic_cache is not None:
+            cached = semantic_cache.get(prompt)
+            if cached is not None:
+                return cached
+    disk_key = None
+    if caching and cache_dir is not None:
+        from sigma import llm_cache
+
+        disk_key = llm_cache.cache_key(display_name, normalized_url, body)
+        record = llm_cache.get(disk_key, cache_dir)
+        if record is not None:
+            return _response_from_record(record)
+    if _AUTH_ERROR is not None:
+        raise _AUTH_ERROR
+    headers = _DEFAULT_HEADERS
+
+    raw, status, response_headers, content_type, encoding, content_encoding = (
+        _post(normalized_url, body, headers, timeout)
+    )
+
+    is_json_content = content_type.endswith("json")
+    # The sniff only runs when the declared content type didn't already
+    # settle the question.
+    json_like = is_json_content or (
+        _looks_like_json(raw) and _looks_complete_json(raw)
+    )
+    text_value: str | None
+    parsed_ok = False
+    streamed_ok = False
+    if json_like:
+        if ijson is not None and len(raw) >= _STREAM_THRESHOLD:
+            text_value = _stream_extract_text(raw)
+            streamed_ok = text_value is not None
+    if streamed_ok:
+        pass  # .json() re-parses raw on demand; text came off the stream
+    elif json_like:
+        try:
+            parsed_json = _loads(raw)
+        except ValueError as exc:
+            if is_json_content:
+                raise RuntimeError(
+                    f"LLM endpoint returned invalid JSON: {exc}"
+                ) from exc
+            text_value = raw.decode(encoding, errors="replace")
+        else:
+            parsed_ok = True
+            text_value = _extract_text_for(display_name, parsed_json)
+    else:
+        text_value = raw.decode(encoding, errors="replace")
+
+    result = LLMResponse(
+        name=display_name,
+        url=normalized_url,
+        status=status,
+        headers=response_headers,
+        raw=raw if keep_raw else b"",
+        encoding=encoding,
+        text=text_value,
+        content_encoding=content_encoding,
+        _parsed=parsed_json if parsed_ok else _UNSET,
+    )
+    # Only cache bodies that parsed as JSON so a transient plain-text
+    # error page can never poison later calls.
+    if caching and (parsed_ok or streamed_ok):
+        _RESPONSE_CACHE.set(cache_key, result)
+        if semantic_cache is not None:
+            semantic_cache.set(prompt, result)
+        if disk_key is not None:
+            from sigma import llm_cache
+
+            llm_cache.set(disk_key, _record_from_response(result), cache_dir)
+    return result
+
+
+def query_llm_many(
+    prompts: list[str],
+    name: str | None = None,
+    *,
+    max_concurrency: int = 8,
+    path: str | os.PathLike[str] | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    extra_payload: Mapping[str, Any] | None = None,
+    use_cache: bool = True,
+    semantic_cache: SemanticCache | None = None,
+) -> list[LLMResponse]:
+    """Send several prompts concurrently and return responses in order.
+
+    K independent prompts complete in roughly K * latency /
+    *max_concurrency* wall-time instead of running back to back. Each
+    worker goes through :func:`query_llm`, so caching and the pooled
+    transport apply per prompt.
+    """
+    if not prompts:
+        return []
+    workers = min(max_concurrency, len(prompts))
+    if workers <= 1:
+        return [
+            query_llm(
+                prompt,
+                name,
+                path=path,
+                timeout=timeout,
+                extra_payload=extra_payload,
+                use_cache=use_cache,
+                semantic_cache=semantic_cache,
+            )
+            for prompt in prompts
+        ]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                query_llm,
+                prompt,
+                name,
+                path=path,
+                timeout=timeout,
+                extra_payload=extra_payload,
+                use_cache=use_cache,
+                semantic_cache=semantic_cache,
+            )
+            for prompt in prompts
+        ]
+        return [future.result() for future in futures]
+
+
+class ConfiguredLLMRouter:
+    """Bind an endpoint, auth and defaults once; route queries cheaply.
+
+    Construction resolves the endpoint and snapshots the auth header, so
+    per-request work skips the env reads and llms.txt lookups entirely
+    (the resolve memo is pre-seeded with this router's endpoint).
+    Resolution failures are deferred and raised on first use, and
+    :meth:`refresh` re-reads both after a token rotation or file edit.
+    """
+
+    def __init__(
+        self,
+        name: str | None = None,
+        *,
+        path: str | os.PathLike[str] | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache_dir: str | os.PathLike[str] | None = None,
+    ) -> None:
+        self._name = name
+        self._path = os.fspath(path) if path is not None else None
+        self._timeout = timeout
+        self._cache_dir = cache_dir
+        self._endpoint: tuple[str, str] | None = None
+        self._resolve_error: Exception | None = None
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Re-resolve the endpoint and rebuild the auth snapshot."""
+        refresh_auth()
+        _resolve_cached.cache_clear()
+        try:
+            self._endpoint = _resolve_cached(self._name, self._path)
+        except (RuntimeError, OSError) as exc:
+            self._endpoint = None
+            self._resolve_error = exc
+        else:
+            self._resolve_error = None
+
+    @property
+    def endpoint(self) -> tuple[str, str]:
+        """The bound ``(display_name, url)`` pair."""
+        if self._endpoint is None:
+            raise RuntimeError(
+                f"could not resolve LLM endpoint: {self._resolve_error}"
+            )
+        return self._endpoint
+
+    def query(self, prompt: str, **kwargs: Any) -> LLMResponse:
+        """Query the bound endpoint; kwargs override the router defaults."""
+        self.endpoint  # surface a deferred resolution error eagerly
+        kwargs.setdefault("timeout", self._timeout)
+        kwargs.setdefault("cache_dir", self._cache_dir)
+        return query_llm(prompt, self._name, path=self._path, **kwargs)
+
+    def query_many(self, prompts: list[str], **kwargs: Any) -> list[LLMResponse]:
+        """Concurrent fanout against the bound endpoint."""
+        self.endpoint
+        kwargs.setdefault("timeout", self._timeout)
+        return query_llm_many(prompts, self._name, path=self._path, **kwargs)
+
+
+async def query_llm_async(
+    prompt: str,
+    name: str | None = None,
+    **kwargs: Any,
+) -> LLMResponse:
+    """Coroutine flavour of :func:`query_llm`.
+
+    The blocking call runs in a worker thread (the same pattern
+    :mod:`sigma.conversation` uses), so awaiting several of these
+    overlaps their network time without an extra HTTP stack.
+    """
+    import asyncio
+
+    return await asyncio.to_thread(query_llm, prompt, name, **kwargs)
+
+
+async def query_llm_many_async(
+    prompts: list[str],
+    name: str | None = None,
+    *,
+    max_concurrency: int = 8,
+    **kwargs: Any,
+) -> list[LLMResponse]:
+    """Fan out *prompts* concurrently, capped at *max_concurrency*."""
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _one(prompt: str) -> LLMResponse:
+        async with semaphore:
+            return await query_llm_async(prompt, name, **kwargs)
+
+    return list(await asyncio.gather(*(_one(prompt) for prompt in prompts)))
+
+
+_PARSER = None
+
+
+def _get_parser():
+    # argparse is CLI-only; importing and building the parser here (and
+    # only once) keeps library imports cheap and repeated main() calls
+    # from re-running seven add_argument set-ups.
+    global _PARSER
+    if _PARSER is None:
+        import argparse
+
+        parser = argparse.ArgumentParser(
+            description="Query a configured LLM endpoint"
+        )
+        parser.add_argument(
+            "prompt", nargs="?", help="prompt text (defaults to stdin)"
+        )
+        parser.add_argument("--name", help="endpoint name from llms.txt")
+        parser.add_argument("--path", help="path to an alternative llms.txt")
+        parser.add_argument(
+            "--timeout", type=float, default=DEFAULT_TIMEOUT, help="request timeout"
+        )
+        parser.add_argument(
+            "--show-json", action="store_true", help="print the parsed JSON body"
+        )
+        parser.add_argument(
+            "--no-cache", action="store_true", help="always query the endpoint"
+        )
+        _PARSER = parser
+    return _PARSER
+
+
+def _parse_cli_args(argv: list[str] | None):
+    return _get_parser().parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import sys
+
+    namespace = _parse_cli_args(argv)
+    prompt = namespace.prompt if namespace.prompt is not None else sys.stdin.read()
+    response = query_llm(
+        prompt,
+        namespace.name,
+        path=namespace.path,
+        timeout=namespace.timeout,
+        use_cache=not namespace.no_cache,
+    )
+    if namespace.show_json:
+        print(json.dumps(response.json(), indent=2, ensure_ascii=False))
+    elif response.text is not None:
+        print(response.text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
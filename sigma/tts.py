@@ -0,0 +1,41 @@
+"""Client for a local text-to-speech server.
+
+Posts text to the server and returns the synthesised audio bytes,
+ready to be played or written to disk by the caller.
+"""
+
+from __future__ import annotations
+
+import json
+from urllib import error, request
+
+DEFAULT_TTS_URL = "http://localhost:5002/api/tts"
+DEFAULT_TIMEOUT = 60.0
+
+
+def synthesize_speech(
+    text: str,
+    *,
+    url: str | None = None,
+    voice: str | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> bytes:
+    """Synthesise *text* and return the raw audio bytes."""
+    payload: dict[str, str] = {"text": text}
+    if voice is not None:
+        payload["voice"] = voice
+    req = request.Request(
+        url or DEFAULT_TTS_URL,
+        data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        headers={"Content-Type": "application/json; charset=utf-8"},
+        method="POST",
+    )
+    try:
+        with request.urlopen(req, timeout=timeout) as response:
+            return response.read()
+    except error.HTTPError as exc:
+        raise RuntimeError(
+            f"TTS server returned HTTP {exc.code}: {exc.reason}"
+        ) from exc
+    except error.URLError as exc:
+        raise RuntimeError(f"could not reach TTS server: {exc.reason}") from exc
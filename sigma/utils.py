@@ -0,0 +1,10 @@
+"""Small shared helpers."""
+
+from __future__ import annotations
+
+
+def clamp(value: float, low: float, high: float) -> float:
+    """Clamp *value* to the inclusive range [low, high]."""
+    if low > high:
+        raise ValueError("low must not exceed high")
+    return max(low, min(high, value))
@@ -0,0 +1,108 @@
+"""Client for a whisper.cpp transcription server.
+
+Posts recorded audio to the server's ``/inference`` endpoint as
+multipart form data and returns the transcribed text.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+from urllib import error, request
+
+DEFAULT_WHISPER_URL = "http://localhost:8080/inference"
+DEFAULT_TIMEOUT = 60.0
+
+
+@dataclass(frozen=True)
+class TranscriptionResult:
+    """Transcribed text plus the language whisper detected, if any."""
+
+    text: str
+    language: str | None = None
+
+
+def _encode_multipart(
+    fields: Mapping[str, str], filename: str, audio: bytes
+) -> tuple[bytes, str]:
+    """Encode *fields* and one audio file as multipart/form-data."""
+    boundary = uuid.uuid4().hex
+    parts: list[bytes] = []
+    for key, value in fields.items():
+        parts.append(
+            (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="{key}"\r\n\r\n'
+                f"{value}\r\n"
+            ).encode("utf-8")
+        )
+    parts.append(
+        (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; '
+            f'filename="{filename}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode("utf-8")
+    )
+    parts.append(audio)
+    parts.append(f"\r\n--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def transcribe_audio(
+    audio_path: str | os.PathLike[str],
+    *,
+    url: str | None = None,
+    model: str | None = None,
+    language: str | None = None,
+    temperature: float | None = None,
+    extra_params: Mapping[str, Any] | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> TranscriptionResult:
+    """Transcribe the audio file at *audio_path* via the whisper server."""
+    source = Path(audio_path)
+    fields: dict[str, str] = {"response_format": "json"}
+    if model is not None:
+        fields["model"] = model
+    if language is not None:
+        fields["language"] = language
+    if temperature is not None:
+        fields["temperature"] = str(temperature)
+    if extra_params:
+        for key, value in extra_params.items():
+            fields[str(key)] = str(value)
+
+    body, content_type = _encode_multipart(fields, source.name, source.read_bytes())
+    req = request.Request(
+        url or DEFAULT_WHISPER_URL,
+        data=body,
+        headers={"Content-Type": content_type},
+        method="POST",
+    )
+    try:
+        with request.urlopen(req, timeout=timeout) as response:
+            raw = response.read()
+            encoding = response.headers.get_content_charset() or "utf-8"
+    except error.HTTPError as exc:
+        raise RuntimeError(
+            f"whisper server returned HTTP {exc.code}: {exc.reason}"
+        ) from exc
+    except error.URLError as exc:
+        raise RuntimeError(f"could not reach whisper server: {exc.reason}") from exc
+
+    try:
+        payload = json.loads(raw.decode(encoding, errors="replace"))
+    except ValueError as exc:
+        raise RuntimeError(f"whisper server returned invalid JSON: {exc}") from exc
+    text = payload.get("text")
+    if not isinstance(text, str):
+        raise RuntimeError("whisper server response is missing 'text'")
+    detected = payload.get("language")
+    return TranscriptionResult(
+        text=text.strip(),
+        language=detected if isinstance(detected, str) else None,
+    )